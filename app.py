@@ -1,9 +1,10 @@
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, render_template, request, jsonify, session, g, abort, Response
 import json
 import time
+import click
 from config import config
 from models import PasswordAnalysis, BreachResult
-from services import PasswordAnalyzerService, BreachCheckerService, EncryptionService
+from services import PasswordAnalyzerService, BreachCheckerService, EncryptionService, HashAuditService, ProfilingService
 from utils import InputValidator
 
 app = Flask(__name__)
@@ -12,6 +13,37 @@ app.config.from_object(config['default'])
 analyzer_service = PasswordAnalyzerService()
 breach_service = BreachCheckerService()
 encryption_service = EncryptionService()
+profiling_service = ProfilingService()
+
+@app.before_request
+def start_request_profile():
+    if not profiling_service.enabled:
+        return
+    
+    trigger = profiling_service.select_trigger(request.endpoint, request.headers)
+    if trigger:
+        g.profile_handle = profiling_service.start_profile()
+        g.profile_trigger = trigger
+
+@app.after_request
+def finish_request_profile(response):
+    handle = g.pop('profile_handle', None)
+    if handle:
+        try:
+            record = profiling_service.stop_profile(handle, request.method, request.path,
+                                                    request.endpoint, g.pop('profile_trigger', None),
+                                                    response.status_code)
+        except Exception:
+            profiling_service.discard_profile(handle)
+            return response
+        response.headers['X-Profile-Id'] = record.profile_id
+    return response
+
+@app.teardown_request
+def discard_request_profile(exc):
+    handle = g.pop('profile_handle', None)
+    if handle:
+        profiling_service.discard_profile(handle)
 
 @app.route('/')
 def index():
@@ -77,5 +109,59 @@ def security_intelligence():
     intelligence = breach_service.get_security_intelligence()
     return jsonify(intelligence)
 
+def _require_profile_admin():
+    if not profiling_service.is_admin(request.headers.get(profiling_service.admin_header)):
+        abort(404)
+
+@app.route('/admin/profiles')
+def list_profiles():
+    _require_profile_admin()
+    return jsonify({
+        'enabled': profiling_service.enabled,
+        'sample_rate': profiling_service.sample_rate,
+        'profiles': profiling_service.list_profiles()
+    })
+
+@app.route('/admin/profiles/<profile_id>')
+def download_profile(profile_id):
+    _require_profile_admin()
+    
+    record = profiling_service.get_profile(profile_id)
+    if record is None:
+        abort(404)
+    
+    output_format = request.args.get('format', 'pstats')
+    if output_format == 'pstats':
+        return Response(profiling_service.export_pstats(record),
+                        mimetype='application/octet-stream',
+                        headers={'Content-Disposition': f'attachment; filename={profile_id}.pstats'})
+    elif output_format == 'collapsed':
+        return Response(profiling_service.export_collapsed(record),
+                        mimetype='text/plain',
+                        headers={'Content-Disposition': f'attachment; filename={profile_id}.folded'})
+    
+    return jsonify({'error': 'UNSUPPORTED_PROFILE_FORMAT'}), 400
+
+@app.cli.command('audit-hashes')
+@click.argument('input_path', type=click.Path(exists=True, dir_okay=False))
+@click.argument('report_path', type=click.Path(dir_okay=False, writable=True))
+@click.option('--offline', is_flag=True, help='Only use locally cached hash ranges, including expired ones.')
+@click.option('--no-cache-ranges', is_flag=True, help='Do not store fetched hash ranges locally.')
+def audit_hashes(input_path, report_path, offline, no_cache_ranges):
+    audit_service = HashAuditService(breach_service)
+    
+    def report_progress(result):
+        click.echo(f"[AUDIT] prefixes={result.prefixes_processed} "
+                   f"hashes={result.distinct_hashes} exposed={result.exposed_hashes} "
+                   f"fetched={result.ranges_fetched} cached={result.ranges_from_cache} "
+                   f"stale={result.ranges_stale} "
+                   f"failed={result.ranges_failed} elapsed={result.elapsed_time}s", err=True)
+    
+    result = audit_service.audit_hash_file(input_path, report_path,
+                                           offline=offline,
+                                           cache_ranges=not no_cache_ranges,
+                                           progress_callback=report_progress)
+    click.echo(json.dumps(result.to_dict(), indent=2))
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -7,6 +7,21 @@ class Config:
     MIN_PASSWORD_LENGTH = 4
     BREACH_API_URL = "https://api.pwnedpasswords.com/range/"
     CACHE_TIMEOUT = 3600
+    RANGE_CACHE_DIR = 'data/ranges'
+    RANGE_CACHE_TIMEOUT = 7 * 24 * 3600
+    AUDIT_SORT_CHUNK_SIZE = 1000000
+    AUDIT_MERGE_FAN_IN = 64
+    AUDIT_RANGE_DELAY = 0.0
+    AUDIT_FETCH_WORKERS = 8
+    AUDIT_PROGRESS_INTERVAL = 1000
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '').lower() in ('1', 'true', 'yes')
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0.0))
+    PROFILE_BUFFER_SIZE = 20
+    PROFILE_STACK_SAMPLE_INTERVAL = 0.005
+    PROFILE_ENDPOINTS = ['api_analyze', 'analyze_password']
+    PROFILE_TRIGGER_HEADER = 'X-Profile-Request'
+    PROFILE_ADMIN_HEADER = 'X-Admin-Token'
+    PROFILE_ADMIN_TOKEN = os.environ.get('PROFILE_ADMIN_TOKEN')
     LOG_LEVEL = 'INFO'
     
 class DevelopmentConfig(Config):
@@ -1,4 +1,6 @@
 from .password_model import PasswordAnalysis
 from .breach_model import BreachResult
+from .audit_model import HashAuditResult
+from .profile_model import ProfileRecord
 
-__all__ = ['PasswordAnalysis', 'BreachResult']
\ No newline at end of file
+__all__ = ['PasswordAnalysis', 'BreachResult', 'HashAuditResult', 'ProfileRecord']
\ No newline at end of file
@@ -0,0 +1,49 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+@dataclass
+class HashAuditResult:
+    input_path: str
+    report_path: str
+    total_lines: int = 0
+    valid_hashes: int = 0
+    invalid_lines: int = 0
+    duplicate_hashes: int = 0
+    distinct_hashes: int = 0
+    sort_runs: int = 0
+    prefixes_processed: int = 0
+    ranges_from_cache: int = 0
+    ranges_stale: int = 0
+    ranges_fetched: int = 0
+    ranges_failed: int = 0
+    exposed_hashes: int = 0
+    total_exposure: int = 0
+    max_range_age: Optional[float] = None
+    elapsed_time: Optional[float] = None
+    errors: List[str] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict:
+        return {
+            'input_path': self.input_path,
+            'report_path': self.report_path,
+            'total_lines': self.total_lines,
+            'valid_hashes': self.valid_hashes,
+            'invalid_lines': self.invalid_lines,
+            'duplicate_hashes': self.duplicate_hashes,
+            'distinct_hashes': self.distinct_hashes,
+            'sort_runs': self.sort_runs,
+            'prefixes_processed': self.prefixes_processed,
+            'ranges_from_cache': self.ranges_from_cache,
+            'ranges_stale': self.ranges_stale,
+            'ranges_fetched': self.ranges_fetched,
+            'ranges_failed': self.ranges_failed,
+            'exposed_hashes': self.exposed_hashes,
+            'total_exposure': self.total_exposure,
+            'max_range_age': self.max_range_age,
+            'elapsed_time': self.elapsed_time,
+            'errors': self.errors
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict):
+        return cls(**data)
@@ -0,0 +1,31 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+@dataclass
+class ProfileRecord:
+    profile_id: str
+    method: str
+    path: str
+    endpoint: Optional[str]
+    trigger: str
+    timestamp: float
+    duration: float
+    status_code: Optional[int] = None
+    components: Dict[str, float] = field(default_factory=dict)
+    samples: int = 0
+    stats: Dict = field(default_factory=dict, repr=False)
+    stacks: Dict[str, int] = field(default_factory=dict, repr=False)
+    
+    def to_dict(self) -> Dict:
+        return {
+            'profile_id': self.profile_id,
+            'method': self.method,
+            'path': self.path,
+            'endpoint': self.endpoint,
+            'trigger': self.trigger,
+            'timestamp': self.timestamp,
+            'duration': self.duration,
+            'status_code': self.status_code,
+            'components': self.components,
+            'samples': self.samples
+        }
@@ -1,5 +1,7 @@
 from .analyzer_service import PasswordAnalyzerService
 from .breach_service import BreachCheckerService
 from .encryption_service import EncryptionService
+from .hash_audit_service import HashAuditService
+from .profiling_service import ProfilingService
 
-__all__ = ['PasswordAnalyzerService', 'BreachCheckerService', 'EncryptionService']
\ No newline at end of file
+__all__ = ['PasswordAnalyzerService', 'BreachCheckerService', 'EncryptionService', 'HashAuditService', 'ProfilingService']
\ No newline at end of file
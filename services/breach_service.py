@@ -3,7 +3,7 @@ import hashlib
 import time
 import json
 import os
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from models.breach_model import BreachResult
 from config import Config
 
@@ -119,24 +119,37 @@ class BreachCheckerService:
             pass
     
     def _query_breach_api(self, prefix: str, suffix: str) -> int:
+        for hash_part, count in self.fetch_hash_range(prefix):
+            if hash_part == suffix:
+                return count
+        return 0
+    
+    def fetch_hash_range(self, prefix: str) -> List[Tuple[str, int]]:
         try:
             response = self.session.get(f"{self.api_url}{prefix}")
             
             if response.status_code == 200:
-                for line in response.text.splitlines():
-                    hash_part, count = line.split(':')
-                    if hash_part == suffix:
-                        return int(count)
-                return 0
+                return self.parse_hash_range(response.text)
             elif response.status_code == 404:
-                return 0
+                return []
             else:
                 response.raise_for_status()
+                raise Exception("API communication failure")
         except requests.exceptions.RequestException:
             raise Exception("API communication failure")
         except ValueError:
             raise Exception("API response parsing error")
     
+    @staticmethod
+    def parse_hash_range(text: str) -> List[Tuple[str, int]]:
+        entries = []
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            hash_part, count = line.split(':')
+            entries.append((hash_part.strip().upper(), int(count)))
+        return entries
+    
     def _assess_breach_risk(self, breach_count: int) -> Dict:
         if breach_count >= 1000:
             risk_level = "CRITICAL"
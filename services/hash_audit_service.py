@@ -0,0 +1,247 @@
+import csv
+import heapq
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby, islice
+from typing import Callable, Iterator, List, Optional, Tuple
+from models.audit_model import HashAuditResult
+from services.breach_service import BreachCheckerService
+from config import Config
+
+SHA1_PATTERN = re.compile(r'^[0-9A-F]{40}$')
+MAX_RECORDED_ERRORS = 100
+
+class HashAuditService:
+    def __init__(self, breach_service: Optional[BreachCheckerService] = None,
+                 range_cache_dir: Optional[str] = None):
+        self.breach_service = breach_service or BreachCheckerService()
+        self.range_cache_dir = range_cache_dir or Config.RANGE_CACHE_DIR
+        self.range_cache_timeout = Config.RANGE_CACHE_TIMEOUT
+        self.chunk_size = Config.AUDIT_SORT_CHUNK_SIZE
+        self.merge_fan_in = Config.AUDIT_MERGE_FAN_IN
+        self.range_delay = Config.AUDIT_RANGE_DELAY
+        self.fetch_workers = max(1, Config.AUDIT_FETCH_WORKERS)
+        self.result_lock = threading.Lock()
+        self.progress_interval = Config.AUDIT_PROGRESS_INTERVAL
+    
+    def audit_hash_file(self, input_path: str, report_path: str, offline: bool = False,
+                        cache_ranges: bool = True,
+                        progress_callback: Optional[Callable[[HashAuditResult], None]] = None) -> HashAuditResult:
+        start_time = time.time()
+        result = HashAuditResult(input_path=input_path, report_path=report_path)
+        
+        with tempfile.TemporaryDirectory(prefix='hash_audit_') as work_dir:
+            runs = self._write_sorted_runs(input_path, work_dir, result)
+            result.sort_runs = len(runs)
+            runs = self._reduce_runs(runs, work_dir)
+            
+            with open(report_path, 'w', newline='') as report_file:
+                writer = csv.writer(report_file)
+                writer.writerow(['hash', 'exposure_count', 'occurrences', 'status'])
+                
+                sorted_hashes = self._merge_runs(runs)
+                prefix_groups = ((prefix, list(group)) for prefix, group in
+                                 groupby(self._count_occurrences(sorted_hashes, result), key=lambda item: item[0][:5]))
+                
+                with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+                    while True:
+                        batch = list(islice(prefix_groups, self.fetch_workers * 4))
+                        if not batch:
+                            break
+                        
+                        hash_ranges = executor.map(
+                            lambda item: self._load_range(item[0], result, offline, cache_ranges), batch)
+                        for (_, hashes), hash_range in zip(batch, hash_ranges):
+                            self._audit_prefix(hashes, hash_range, writer, result)
+                            result.prefixes_processed += 1
+                            
+                            if progress_callback and result.prefixes_processed % self.progress_interval == 0:
+                                result.elapsed_time = round(time.time() - start_time, 3)
+                                progress_callback(result)
+        
+        result.elapsed_time = round(time.time() - start_time, 3)
+        if progress_callback:
+            progress_callback(result)
+        return result
+    
+    def _write_sorted_runs(self, input_path: str, work_dir: str, result: HashAuditResult) -> List[str]:
+        runs = []
+        chunk = []
+        
+        with open(input_path, 'r', encoding='utf-8', errors='replace') as input_file:
+            for line in input_file:
+                result.total_lines += 1
+                sha1_hash = self._normalize_hash(line)
+                if sha1_hash is None:
+                    if line.strip():
+                        result.invalid_lines += 1
+                    continue
+                
+                result.valid_hashes += 1
+                chunk.append(sha1_hash)
+                if len(chunk) >= self.chunk_size:
+                    runs.append(self._write_run(chunk, work_dir, len(runs)))
+                    chunk = []
+        
+        if chunk:
+            runs.append(self._write_run(chunk, work_dir, len(runs)))
+        return runs
+    
+    def _normalize_hash(self, line: str) -> Optional[str]:
+        candidate = line.strip().split(':', 1)[0].strip().upper()
+        if SHA1_PATTERN.match(candidate):
+            return candidate
+        return None
+    
+    def _write_run(self, chunk: List[str], work_dir: str, index: int) -> str:
+        chunk.sort()
+        run_path = os.path.join(work_dir, f'run_{index:06d}.txt')
+        with open(run_path, 'w') as run_file:
+            run_file.writelines(f'{sha1_hash}\n' for sha1_hash in chunk)
+        return run_path
+    
+    def _reduce_runs(self, runs: List[str], work_dir: str) -> List[str]:
+        generation = 0
+        while len(runs) > self.merge_fan_in:
+            merged_runs = []
+            for start in range(0, len(runs), self.merge_fan_in):
+                group = runs[start:start + self.merge_fan_in]
+                run_path = os.path.join(work_dir, f'merge_{generation:03d}_{start:06d}.txt')
+                with open(run_path, 'w') as run_file:
+                    run_file.writelines(f'{sha1_hash}\n' for sha1_hash in self._merge_runs(group))
+                for path in group:
+                    os.remove(path)
+                merged_runs.append(run_path)
+            runs = merged_runs
+            generation += 1
+        return runs
+    
+    def _merge_runs(self, runs: List[str]) -> Iterator[str]:
+        files = [open(path, 'r') for path in runs]
+        try:
+            for line in heapq.merge(*files):
+                yield line.rstrip('\n')
+        finally:
+            for run_file in files:
+                run_file.close()
+    
+    def _count_occurrences(self, sorted_hashes: Iterator[str], result: HashAuditResult) -> Iterator[Tuple[str, int]]:
+        for sha1_hash, group in groupby(sorted_hashes):
+            occurrences = sum(1 for _ in group)
+            result.distinct_hashes += 1
+            result.duplicate_hashes += occurrences - 1
+            yield sha1_hash, occurrences
+    
+    def _audit_prefix(self, hashes: List[Tuple[str, int]], hash_range: Optional[List[Tuple[str, int]]],
+                      writer, result: HashAuditResult):
+        if hash_range is None:
+            for sha1_hash, occurrences in hashes:
+                writer.writerow([sha1_hash, '', occurrences, 'UNAVAILABLE'])
+            return
+        
+        range_index = 0
+        for sha1_hash, occurrences in hashes:
+            suffix = sha1_hash[5:]
+            while range_index < len(hash_range) and hash_range[range_index][0] < suffix:
+                range_index += 1
+            
+            count = 0
+            if range_index < len(hash_range) and hash_range[range_index][0] == suffix:
+                count = hash_range[range_index][1]
+            
+            if count > 0:
+                result.exposed_hashes += 1
+                result.total_exposure += count
+                writer.writerow([sha1_hash, count, occurrences, 'EXPOSED'])
+            else:
+                writer.writerow([sha1_hash, 0, occurrences, 'CLEAN'])
+    
+    def _load_range(self, prefix: str, result: HashAuditResult, offline: bool,
+                    cache_ranges: bool) -> Optional[List[Tuple[str, int]]]:
+        cache_path = os.path.join(self.range_cache_dir, f'{prefix}.txt')
+        cache_age = None
+        
+        if os.path.exists(cache_path):
+            try:
+                cache_age = max(0.0, time.time() - os.path.getmtime(cache_path))
+            except OSError as e:
+                self._record_error(result, f"{prefix}: cached range unreadable ({e})")
+        
+        stale = cache_age is not None and cache_age >= self.range_cache_timeout
+        if stale:
+            with self.result_lock:
+                result.ranges_stale += 1
+        
+        if cache_age is not None and (not stale or offline):
+            hash_range = self._read_cached_range(prefix, cache_path, cache_age, result)
+            if hash_range is not None:
+                return hash_range
+        
+        if offline:
+            with self.result_lock:
+                result.ranges_failed += 1
+            return None
+        
+        try:
+            if self.range_delay:
+                time.sleep(self.range_delay)
+            hash_range = self.breach_service.fetch_hash_range(prefix)
+        except Exception as e:
+            if stale:
+                self._record_error(result, f"{prefix}: {e}; using stale cached range")
+                hash_range = self._read_cached_range(prefix, cache_path, cache_age, result)
+                if hash_range is not None:
+                    return hash_range
+            else:
+                self._record_error(result, f"{prefix}: {e}")
+            with self.result_lock:
+                result.ranges_failed += 1
+            return None
+        
+        with self.result_lock:
+            result.ranges_fetched += 1
+        if cache_ranges:
+            self._store_range(prefix, cache_path, hash_range, result)
+        return sorted(hash_range)
+    
+    def _read_cached_range(self, prefix: str, cache_path: str, cache_age: float,
+                           result: HashAuditResult) -> Optional[List[Tuple[str, int]]]:
+        try:
+            with open(cache_path, 'r') as cache_file:
+                hash_range = self.breach_service.parse_hash_range(cache_file.read())
+        except (OSError, ValueError) as e:
+            self._record_error(result, f"{prefix}: cached range unreadable ({e})")
+            return None
+        
+        with self.result_lock:
+            result.ranges_from_cache += 1
+            result.max_range_age = max(result.max_range_age or 0.0, round(cache_age, 3))
+        return sorted(hash_range)
+    
+    def _record_error(self, result: HashAuditResult, message: str):
+        with self.result_lock:
+            if len(result.errors) < MAX_RECORDED_ERRORS:
+                result.errors.append(message)
+    
+    def _store_range(self, prefix: str, cache_path: str, hash_range: List[Tuple[str, int]],
+                     result: HashAuditResult):
+        temp_path = None
+        try:
+            os.makedirs(self.range_cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix='.range_', suffix='.tmp', dir=self.range_cache_dir)
+            with os.fdopen(fd, 'w') as cache_file:
+                cache_file.writelines(f'{suffix}:{count}\n' for suffix, count in hash_range)
+                cache_file.flush()
+                os.fsync(cache_file.fileno())
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            self._record_error(result, f"{prefix}: range not cached ({e})")
+            if temp_path and os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
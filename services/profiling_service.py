@@ -0,0 +1,179 @@
+import cProfile
+import hmac
+import marshal
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from models.profile_model import ProfileRecord
+from config import Config
+
+COMPONENT_ENTRY_POINTS = {
+    'analyzer': [('services/analyzer_service.py', 'analyze_password')],
+    'breach': [('services/breach_service.py', 'check_password_breach')],
+    'zxcvbn': [('zxcvbn/__init__.py', 'zxcvbn')],
+    'templates': [('flask/templating.py', 'render_template')]
+}
+
+COMPONENT_PARENTS = {
+    'zxcvbn': 'analyzer'
+}
+
+MAX_STACK_DEPTH = 64
+MAX_COLLAPSED_STACKS = 2000
+OVERFLOW_STACK = '[other]'
+
+class StackSampler(threading.Thread):
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name='request-stack-sampler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = {}
+        self.samples = 0
+        self.labels = {}
+        self.stopped = threading.Event()
+    
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._record(frame)
+    
+    def stop(self) -> Dict[str, int]:
+        self.stopped.set()
+        self.join()
+        return self.stacks
+    
+    def _record(self, frame):
+        frames = []
+        while frame is not None:
+            frames.append(self._frame_label(frame.f_code))
+            frame = frame.f_back
+        
+        if len(frames) > MAX_STACK_DEPTH:
+            frames = frames[:MAX_STACK_DEPTH] + ['[truncated]']
+        stack = ';'.join(reversed(frames))
+        
+        if stack not in self.stacks and len(self.stacks) >= MAX_COLLAPSED_STACKS:
+            stack = OVERFLOW_STACK
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        self.samples += 1
+    
+    def _frame_label(self, code) -> str:
+        label = self.labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})".replace(';', '_')
+            self.labels[code] = label
+        return label
+
+class ProfilingService:
+    def __init__(self):
+        self.enabled = Config.PROFILING_ENABLED
+        self.sample_rate = Config.PROFILE_SAMPLE_RATE
+        self.endpoints = set(Config.PROFILE_ENDPOINTS)
+        self.trigger_header = Config.PROFILE_TRIGGER_HEADER
+        self.admin_header = Config.PROFILE_ADMIN_HEADER
+        self.admin_token = Config.PROFILE_ADMIN_TOKEN
+        self.stack_sample_interval = Config.PROFILE_STACK_SAMPLE_INTERVAL
+        self.profiles = deque(maxlen=Config.PROFILE_BUFFER_SIZE)
+        self.lock = threading.Lock()
+    
+    def is_admin(self, token: Optional[str]) -> bool:
+        if not self.admin_token or not token:
+            return False
+        return hmac.compare_digest(token.encode('utf-8'), self.admin_token.encode('utf-8'))
+    
+    def select_trigger(self, endpoint: Optional[str], headers) -> Optional[str]:
+        if not self.enabled or endpoint not in self.endpoints:
+            return None
+        
+        if self.is_admin(headers.get(self.trigger_header)):
+            return 'HEADER'
+        
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return 'SAMPLED'
+        
+        return None
+    
+    def start_profile(self) -> Optional[Tuple[cProfile.Profile, StackSampler, float]]:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            return None
+        
+        sampler = StackSampler(threading.get_ident(), self.stack_sample_interval)
+        sampler.start()
+        return profiler, sampler, time.perf_counter()
+    
+    def stop_profile(self, handle: Tuple[cProfile.Profile, StackSampler, float], method: str, path: str,
+                     endpoint: Optional[str], trigger: str, status_code: Optional[int]) -> ProfileRecord:
+        profiler, sampler, started = handle
+        profiler.disable()
+        stacks = sampler.stop()
+        duration = time.perf_counter() - started
+        
+        stats = pstats.Stats(profiler).stats
+        record = ProfileRecord(
+            profile_id=uuid.uuid4().hex[:16],
+            method=method,
+            path=path,
+            endpoint=endpoint,
+            trigger=trigger,
+            timestamp=time.time(),
+            duration=round(duration, 6),
+            status_code=status_code,
+            components=self._attribute_components(stats, duration),
+            samples=sampler.samples,
+            stats=stats,
+            stacks=stacks
+        )
+        
+        with self.lock:
+            self.profiles.append(record)
+        return record
+    
+    def discard_profile(self, handle: Tuple[cProfile.Profile, StackSampler, float]):
+        profiler, sampler, _ = handle
+        profiler.disable()
+        sampler.stop()
+    
+    def list_profiles(self) -> List[Dict]:
+        with self.lock:
+            return [record.to_dict() for record in reversed(self.profiles)]
+    
+    def get_profile(self, profile_id: str) -> Optional[ProfileRecord]:
+        with self.lock:
+            for record in self.profiles:
+                if record.profile_id == profile_id:
+                    return record
+        return None
+    
+    def export_pstats(self, record: ProfileRecord) -> bytes:
+        return marshal.dumps(record.stats)
+    
+    def export_collapsed(self, record: ProfileRecord) -> str:
+        return ''.join(f"{stack} {count}\n" for stack, count in sorted(record.stacks.items()))
+    
+    def _attribute_components(self, stats: Dict, duration: float) -> Dict[str, float]:
+        inclusive = {}
+        for component, entry_points in COMPONENT_ENTRY_POINTS.items():
+            total = 0.0
+            for func, (_, _, _, cumulative, _) in stats.items():
+                filename = func[0].replace('\\', '/')
+                for suffix, name in entry_points:
+                    if func[2] == name and filename.endswith(suffix):
+                        total += cumulative
+            inclusive[component] = total
+        
+        exclusive = dict(inclusive)
+        for component, parent in COMPONENT_PARENTS.items():
+            exclusive[parent] = max(0.0, exclusive[parent] - inclusive[component])
+        
+        components = {component: round(total, 6) for component, total in exclusive.items()}
+        components['other'] = round(max(0.0, duration - sum(exclusive.values())), 6)
+        return components
@@ -0,0 +1,185 @@
+import csv
+import os
+import time
+
+import pytest
+
+from services.breach_service import BreachCheckerService
+from services.hash_audit_service import HashAuditService
+
+EXPOSED_PREFIX = 'AAAAA'
+CLEAN_PREFIX = 'BBBBB'
+FAILING_PREFIX = 'CCCCC'
+
+def make_hash(prefix, index):
+    return f"{prefix}{index:035X}"
+
+class StubBreachService(BreachCheckerService):
+    def __init__(self, ranges, failing=()):
+        self.api_url = 'https://example.invalid/range/'
+        self.ranges = ranges
+        self.failing = set(failing)
+        self.fetches = []
+
+    def fetch_hash_range(self, prefix):
+        self.fetches.append(prefix)
+        if prefix in self.failing:
+            raise Exception("API communication failure")
+        return list(self.ranges.get(prefix, []))
+
+class StubResponse:
+    def __init__(self, status_code, text=''):
+        self.status_code = status_code
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+class StubSession:
+    def __init__(self, response):
+        self.response = response
+        self.urls = []
+
+    def get(self, url):
+        self.urls.append(url)
+        return self.response
+
+def read_report(path):
+    with open(path, newline='') as report_file:
+        return list(csv.DictReader(report_file))
+
+def write_lines(path, lines):
+    with open(path, 'w') as input_file:
+        input_file.write('\n'.join(lines) + '\n')
+
+@pytest.fixture
+def audit(tmp_path):
+    def build(ranges, failing=()):
+        breach_service = StubBreachService(ranges, failing)
+        service = HashAuditService(breach_service, range_cache_dir=str(tmp_path / 'ranges'))
+        service.fetch_workers = 2
+        return service, breach_service
+    return build
+
+def test_multi_pass_external_sort_and_single_fetch_per_prefix(audit, tmp_path):
+    hashes = [make_hash(prefix, index) for prefix in (EXPOSED_PREFIX, CLEAN_PREFIX, 'DDDDD') for index in range(12)]
+    exposed = {make_hash(EXPOSED_PREFIX, index)[5:]: index + 1 for index in range(0, 12, 2)}
+    service, breach_service = audit({EXPOSED_PREFIX: sorted(exposed.items())})
+    service.chunk_size = 2
+    service.merge_fan_in = 2
+
+    input_path = tmp_path / 'hashes.txt'
+    write_lines(input_path, list(reversed(hashes)))
+    result = service.audit_hash_file(str(input_path), str(tmp_path / 'report.csv'))
+
+    assert result.sort_runs > service.merge_fan_in ** 2
+    rows = read_report(tmp_path / 'report.csv')
+    assert [row['hash'] for row in rows] == sorted(hashes)
+    assert sorted(breach_service.fetches) == [EXPOSED_PREFIX, CLEAN_PREFIX, 'DDDDD']
+    assert result.ranges_fetched == 3
+    assert result.exposed_hashes == len(exposed)
+    assert result.total_exposure == sum(exposed.values())
+
+def test_report_statuses_and_input_counts(audit, tmp_path):
+    exposed_hash = make_hash(EXPOSED_PREFIX, 1)
+    clean_hash = make_hash(CLEAN_PREFIX, 1)
+    failing_hash = make_hash(FAILING_PREFIX, 1)
+    service, _ = audit({EXPOSED_PREFIX: [(exposed_hash[5:], 42)]}, failing=[FAILING_PREFIX])
+
+    input_path = tmp_path / 'hashes.txt'
+    write_lines(input_path, [
+        exposed_hash.lower(),
+        f"{exposed_hash}:7",
+        clean_hash,
+        failing_hash,
+        'not-a-hash',
+        '',
+        'ABC123'
+    ])
+    result = service.audit_hash_file(str(input_path), str(tmp_path / 'report.csv'))
+
+    rows = {row['hash']: row for row in read_report(tmp_path / 'report.csv')}
+    assert rows[exposed_hash] == {'hash': exposed_hash, 'exposure_count': '42', 'occurrences': '2', 'status': 'EXPOSED'}
+    assert rows[clean_hash]['status'] == 'CLEAN'
+    assert rows[clean_hash]['exposure_count'] == '0'
+    assert rows[failing_hash]['status'] == 'UNAVAILABLE'
+    assert result.total_lines == 7
+    assert result.valid_hashes == 4
+    assert result.invalid_lines == 2
+    assert result.duplicate_hashes == 1
+    assert result.distinct_hashes == 3
+    assert result.ranges_failed == 1
+    assert result.errors == [f"{FAILING_PREFIX}: API communication failure"]
+
+def write_stale_range(service, prefix, entries):
+    os.makedirs(service.range_cache_dir, exist_ok=True)
+    cache_path = os.path.join(service.range_cache_dir, f'{prefix}.txt')
+    with open(cache_path, 'w') as cache_file:
+        cache_file.writelines(f'{suffix}:{count}\n' for suffix, count in entries)
+    stale_time = time.time() - service.range_cache_timeout - 60
+    os.utime(cache_path, (stale_time, stale_time))
+
+def test_stale_cache_is_refetched_online_and_used_offline(audit, tmp_path):
+    target = make_hash(EXPOSED_PREFIX, 3)
+    service, breach_service = audit({EXPOSED_PREFIX: [(target[5:], 9)]})
+    write_stale_range(service, EXPOSED_PREFIX, [(target[5:], 5)])
+    input_path = tmp_path / 'hashes.txt'
+    write_lines(input_path, [target])
+
+    offline = service.audit_hash_file(str(input_path), str(tmp_path / 'offline.csv'), offline=True)
+    assert breach_service.fetches == []
+    assert offline.ranges_stale == 1
+    assert offline.ranges_from_cache == 1
+    assert offline.max_range_age >= service.range_cache_timeout
+    assert read_report(tmp_path / 'offline.csv')[0]['exposure_count'] == '5'
+
+    online = service.audit_hash_file(str(input_path), str(tmp_path / 'online.csv'))
+    assert breach_service.fetches == [EXPOSED_PREFIX]
+    assert online.ranges_stale == 1
+    assert online.ranges_fetched == 1
+    assert online.ranges_from_cache == 0
+    assert read_report(tmp_path / 'online.csv')[0]['exposure_count'] == '9'
+
+def test_stale_cache_is_used_when_refetch_fails(audit, tmp_path):
+    target = make_hash(FAILING_PREFIX, 3)
+    service, breach_service = audit({}, failing=[FAILING_PREFIX])
+    write_stale_range(service, FAILING_PREFIX, [(target[5:], 5)])
+    input_path = tmp_path / 'hashes.txt'
+    write_lines(input_path, [target])
+
+    result = service.audit_hash_file(str(input_path), str(tmp_path / 'report.csv'))
+
+    assert breach_service.fetches == [FAILING_PREFIX]
+    assert result.ranges_stale == 1
+    assert result.ranges_from_cache == 1
+    assert result.ranges_failed == 0
+    assert result.max_range_age >= service.range_cache_timeout
+    assert read_report(tmp_path / 'report.csv')[0]['status'] == 'EXPOSED'
+
+def test_parse_hash_range_skips_blank_lines_and_uppercases_suffixes():
+    text = "0018a45c4d1def81644b54ab7f969b88d65:10\r\n\r\n  \n00D4F6E8FA6EECAD2A3AA415EEC418D38EC:2\n"
+    assert BreachCheckerService.parse_hash_range(text) == [
+        ('0018A45C4D1DEF81644B54AB7F969B88D65', 10),
+        ('00D4F6E8FA6EECAD2A3AA415EEC418D38EC', 2)
+    ]
+
+def make_breach_service(response):
+    breach_service = BreachCheckerService.__new__(BreachCheckerService)
+    breach_service.api_url = 'https://example.invalid/range/'
+    breach_service.session = StubSession(response)
+    return breach_service
+
+def test_query_breach_api_uses_fetched_range():
+    response = StubResponse(200, "0018A45C4D1DEF81644B54AB7F969B88D65:10\n00D4F6E8FA6EECAD2A3AA415EEC418D38EC:2\n")
+    breach_service = make_breach_service(response)
+
+    assert breach_service._query_breach_api('21BD1', '00D4F6E8FA6EECAD2A3AA415EEC418D38EC') == 2
+    assert breach_service._query_breach_api('21BD1', 'FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF') == 0
+    assert breach_service.session.urls == ['https://example.invalid/range/21BD1'] * 2
+
+@pytest.mark.parametrize('status_code', [204, 304])
+def test_fetch_hash_range_raises_on_unexpected_status(status_code):
+    breach_service = make_breach_service(StubResponse(status_code))
+
+    with pytest.raises(Exception, match="API communication failure"):
+        breach_service.fetch_hash_range('21BD1')
@@ -0,0 +1,88 @@
+import sys
+import time
+
+import pytest
+
+import app as app_module
+from models import BreachResult
+from services import profiling_service as profiling_module
+from services.profiling_service import MAX_COLLAPSED_STACKS, MAX_STACK_DEPTH, OVERFLOW_STACK, StackSampler
+
+ADMIN_TOKEN = 'test-admin-token'
+
+@pytest.fixture
+def client(monkeypatch):
+    profiling_service = app_module.profiling_service
+    monkeypatch.setattr(profiling_service, 'enabled', True)
+    monkeypatch.setattr(profiling_service, 'sample_rate', 0.0)
+    monkeypatch.setattr(profiling_service, 'admin_token', ADMIN_TOKEN)
+
+    def stub_breach_check(password):
+        return BreachResult(breached=False, count=0, error=None, hash_prefix=None, timestamp=time.time())
+
+    monkeypatch.setattr(app_module.breach_service, 'check_password_breach', stub_breach_check)
+    monkeypatch.setitem(app_module.app.config, 'TESTING', True)
+    with app_module.app.test_client() as client:
+        yield client
+
+def test_collapsed_export_of_template_request_is_bounded(client):
+    response = client.post('/analyze', data={'password': 'abc123'},
+                           headers={'X-Profile-Request': ADMIN_TOKEN})
+    assert response.status_code == 200
+    profile_id = response.headers['X-Profile-Id']
+
+    record = app_module.profiling_service.get_profile(profile_id)
+    assert len(record.stats) > 100
+    assert set(record.components) == {'analyzer', 'breach', 'zxcvbn', 'templates', 'other'}
+    assert sum(record.components.values()) == pytest.approx(record.duration, abs=1e-3)
+
+    download = client.get(f'/admin/profiles/{profile_id}?format=collapsed',
+                          headers={'X-Admin-Token': ADMIN_TOKEN})
+    assert download.status_code == 200
+
+    lines = download.get_data(as_text=True).splitlines()
+    assert len(lines) <= min(record.samples, MAX_COLLAPSED_STACKS)
+    assert sum(int(line.rsplit(' ', 1)[1]) for line in lines) == record.samples
+    for line in lines:
+        assert len(line.rsplit(' ', 1)[0].split(';')) <= MAX_STACK_DEPTH + 1
+
+def recurse(depth):
+    if depth == 0:
+        return sys._getframe()
+    return recurse(depth - 1)
+
+def test_stack_sampler_truncates_deep_stacks():
+    sampler = StackSampler(thread_id=0, interval=1.0)
+    sampler._record(recurse(MAX_STACK_DEPTH * 2))
+
+    (stack, count), = sampler.stacks.items()
+    frames = stack.split(';')
+    assert count == 1
+    assert len(frames) == MAX_STACK_DEPTH + 1
+    assert frames[0] == '[truncated]'
+    assert frames[-1].startswith('recurse (')
+
+def first_frame():
+    return sys._getframe()
+
+def second_frame():
+    return sys._getframe()
+
+def third_frame():
+    return sys._getframe()
+
+def test_stack_sampler_caps_distinct_stacks(monkeypatch):
+    monkeypatch.setattr(profiling_module, 'MAX_COLLAPSED_STACKS', 2)
+    sampler = StackSampler(thread_id=0, interval=1.0)
+    for capture in (first_frame, second_frame, third_frame, first_frame, third_frame):
+        sampler._record(capture())
+
+    assert len(sampler.stacks) == 3
+    assert sampler.stacks[OVERFLOW_STACK] == 2
+    assert sampler.samples == 5
+    assert sum(sampler.stacks.values()) == sampler.samples
+
+def test_profile_endpoints_require_admin_token(client):
+    assert client.get('/admin/profiles').status_code == 404
+    assert client.get('/admin/profiles', headers={'X-Admin-Token': 'wrong'}).status_code == 404
+    assert client.get('/admin/profiles', headers={'X-Admin-Token': ADMIN_TOKEN}).status_code == 200